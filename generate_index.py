@@ -5,11 +5,17 @@ from pathlib import Path
 from wand.image import Image
 from wand.drawing import Drawing
 from wand.color import Color
+from wand.resource import limits
 import logging
-from typing import List, Dict, Tuple
+from typing import List, Dict, Iterator, Optional, Tuple
 import argparse
 import math
-import re
+import shutil
+import string
+import subprocess
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from itertools import islice
 
 # Set up logging
 logging.basicConfig(
@@ -18,60 +24,377 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Number of images between progress messages at INFO level
+PROGRESS_LOG_INTERVAL = 50
+
+# Index files are screen previews, so favour size and encode speed over fidelity
+DEFAULT_OUTPUT_QUALITY = 75
+JPEG_SAMPLING_FACTOR = '2x2,1x1,1x1'  # 4:2:0 chroma subsampling
+
+# Per-thread image loaders, see get_loader()
+_loader_state = threading.local()
+
+# pyvips is optional; when installed it is used to decode and shrink images
+try:
+    import pyvips
+except (ImportError, OSError):
+    pyvips = None
+
+# Raw formats are always decoded through ImageMagick
+RAW_FORMATS = {'.cr2', '.nef', '.arw', '.orf', '.rw2', '.raf', '.dng'}
+
+# JPEG files can be shrunk by libjpeg while decoding
+JPEG_FORMATS = {'.jpg', '.jpeg'}
+
 # Supported image formats
 SUPPORTED_FORMATS = {
     '.jpg', '.jpeg', '.png', '.gif', '.bmp', '.webp',
-    # Raw formats
-    '.cr2', '.nef', '.arw', '.orf', '.rw2', '.raf', '.dng'
-}
+} | RAW_FORMATS
+
+# Lowercase suffixes as a tuple, for a single str.endswith() check
+SUPPORTED_SUFFIXES = tuple(SUPPORTED_FORMATS)
 
-def is_image_file(file_path: str) -> bool:
+def is_image_file(file_name: str) -> bool:
     """Check if a file is a supported image format."""
-    return Path(file_path).suffix.lower() in SUPPORTED_FORMATS
+    return file_name.lower().endswith(SUPPORTED_SUFFIXES)
 
-def collect_images_by_month(directory: str) -> Dict[str, List[str]]:
+def is_month_name(name: str) -> bool:
+    """Check if a directory name starts with YYYY-MM, without going through the regex engine."""
+    return (len(name) >= 7 and name[4] == '-'
+            and name[:4].isdecimal() and name[5:7].isdecimal())
+
+def scan_images(directory: str, month: Optional[str],
+                dir_mtimes: Optional[Dict[str, float]] = None) -> Iterator[Tuple[str, str]]:
+    """
+    Scan a directory tree, yielding (month, image_path) pairs.
+    The month is taken from the first YYYY-MM directory on the way down and
+    carried into the whole subtree on an explicit stack, so no path is ever re-parsed.
+    If dir_mtimes is given, it is filled with the newest mtime of any directory
+    inside each month, which changes whenever files are added or removed.
+    """
+    stack = [(directory, month)]
+    while stack:
+        path, month = stack.pop()
+        try:
+            it = os.scandir(path)
+        except OSError:
+            continue
+
+        if month and dir_mtimes is not None:
+            try:
+                mtime = os.stat(path).st_mtime
+            except OSError:
+                mtime = float('inf')
+            dir_mtimes[month] = max(dir_mtimes.get(month, 0.0), mtime)
+
+        with it:
+            for entry in it:
+                if entry.is_dir():
+                    # Like os.walk, don't descend into symlinked directories
+                    if not entry.is_symlink():
+                        sub_month = month
+                        if sub_month is None and is_month_name(entry.name):
+                            sub_month = entry.name
+                        stack.append((entry.path, sub_month))
+                elif month and is_image_file(entry.name):
+                    yield month, entry.path
+
+def collect_images_by_month(directory: str,
+                            dir_mtimes: Optional[Dict[str, float]] = None) -> Dict[str, List[str]]:
     """
     Collect images assuming YYYY/YYYY-MM/YYYY-MM-DD directory structure.
     Returns a dictionary with YYYY-MM as keys and lists of image paths as values.
+    If dir_mtimes is given, it is filled with the newest directory mtime per month.
     """
     image_groups = {}
-    month_pattern = re.compile(r'\d{4}-\d{2}')
-    
-    for root, dirs, files in os.walk(directory):
-        # Get the month from the path (parent directory of date folders)
-        path_parts = Path(root).parts
-        month = None
-        
-        # Look for YYYY-MM pattern in the path
-        for part in path_parts:
-            if month_pattern.match(part):
-                month = part
-                break
-        
-        if month:
-            if month not in image_groups:
-                image_groups[month] = []
-            
-            # Add all images in this directory
-            for file in files:
-                if is_image_file(file):
-                    image_groups[month].append(os.path.join(root, file))
+
+    # The root directory itself may already be inside a month directory
+    month = next((part for part in Path(directory).parts if is_month_name(part)), None)
+
+    for month, image_path in scan_images(directory, month, dir_mtimes):
+        image_groups.setdefault(month, []).append(image_path)
     
-    # Sort images within each month by filename (which includes the date)
+    # Sort images within each month by full path: the YYYY-MM-DD day folder keeps
+    # it chronological, while camera file names like IMG_1234.JPG carry no date
     for month in image_groups:
         image_groups[month].sort()
     
     return image_groups
 
+def get_loader() -> Image:
+    """
+    Return this thread's reusable Wand for reading images.
+    Reading every image into the same wand avoids setting up a new
+    MagickWand context per image; each decoder thread gets its own.
+    """
+    loader = getattr(_loader_state, 'image', None)
+    if loader is None:
+        loader = _loader_state.image = Image()
+    return loader
+
+def load_thumbnail(img_path: str, thumbnail_width: int, thumbnail_height: int) -> Image:
+    """
+    Load an image resized to fit within the thumbnail size, maintaining aspect ratio.
+    Uses libvips shrink-on-load when pyvips is available, falling back to Wand
+    for raw formats, when pyvips is not installed, or when libvips can't load the file
+    (e.g. BMP on builds without magickload).
+    """
+    if pyvips is not None and Path(img_path).suffix.lower() not in RAW_FORMATS:
+        try:
+            # no_rotate keeps orientation consistent with the Wand and montage paths
+            tile = pyvips.Image.thumbnail(img_path, thumbnail_width, height=thumbnail_height,
+                                          no_rotate=True)
+            if tile.interpretation != 'srgb':
+                tile = tile.colourspace('srgb')
+            tile = tile.cast('uchar')
+            pixel_format = 'rgba' if tile.hasalpha() else 'rgb'
+            return Image(blob=tile.write_to_memory(), format=pixel_format,
+                         width=tile.width, height=tile.height, depth=8)
+        except pyvips.Error as e:
+            logger.debug(f"libvips could not load {img_path}, using Wand instead: {str(e)}")
+
+    loader = get_loader()
+    if Path(img_path).suffix.lower() in JPEG_FORMATS:
+        # Let libjpeg scale down while decoding (DCT scaling), leaving 2x headroom for the resize
+        loader.options['jpeg:size'] = f'{thumbnail_width * 2}x{thumbnail_height * 2}'
+    else:
+        del loader.options['jpeg:size']
+    try:
+        loader.read(filename=img_path)
+        loader.transform(resize=f'{thumbnail_width}x{thumbnail_height}')
+        return Image(image=loader.sequence[0])
+    finally:
+        # Empty the loader so it doesn't hold on to this image's pixels
+        del loader.sequence[:]
+
+def newest_mtime(paths: List[str], source_mtime: float = 0.0) -> float:
+    """
+    Return the newest mtime among paths and source_mtime.
+    Returns infinity if any path can't be stat'ed, so nothing counts as up to date.
+    """
+    newest = source_mtime
+    for path in paths:
+        try:
+            newest = max(newest, os.stat(path).st_mtime)
+        except OSError:
+            return float('inf')
+    return newest
+
+def is_up_to_date(output_path: str, newest_input_mtime: float) -> bool:
+    """Check if output_path exists and is newer than newest_input_mtime."""
+    try:
+        return os.stat(output_path).st_mtime > newest_input_mtime
+    except OSError:
+        return False
+
+def decode_thumbnail(img_path: str, thumbnail_width: int, thumbnail_height: int) -> Optional[Image]:
+    """
+    Load a thumbnail, logging any error.
+    Runs on a decoder thread; returns None if the image could not be loaded.
+    """
+    try:
+        return load_thumbnail(img_path, thumbnail_width, thumbnail_height)
+    except Exception as e:
+        logger.error(f"Error processing image {img_path}: {str(e)}")
+        return None
+
+def find_montage_command() -> Optional[List[str]]:
+    """Return the command prefix for ImageMagick's montage tool, or None if not installed."""
+    if shutil.which('magick'):
+        return ['magick', 'montage']
+    if shutil.which('montage'):
+        return ['montage']
+    return None
+
+def create_index_with_montage(page_images: List[str], output_path: str,
+                              thumbnails_per_row: int,
+                              thumbnail_width: int,
+                              thumbnail_height: int,
+                              background_color: str,
+                              padding: int,
+                              page_info: Optional[str] = None,
+                              output_quality: int = DEFAULT_OUTPUT_QUALITY) -> bool:
+    """
+    Create an index page with a single ImageMagick montage process.
+    Returns True if the montage command succeeded.
+    """
+    montage = find_montage_command()
+    if montage is None:
+        logger.warning("ImageMagick montage command not found, using Wand instead")
+        return False
+
+    command = montage + [
+        # Let libjpeg shrink JPEGs while decoding (DCT scaling)
+        '-define', f'jpeg:size={thumbnail_width * 2}x{thumbnail_height * 2}',
+        '-label', '%f',
+        # Only the first frame of animated GIF/WebP files, like the Wand and libvips paths
+        *(f'{p}[0]' for p in page_images),
+        '-thumbnail', f'{thumbnail_width}x{thumbnail_height}',
+        '-background', background_color,
+        '-fill', 'black',
+        '-pointsize', '14',
+        '-bordercolor', 'black',
+        '-border', '1',
+        '-tile', f'{thumbnails_per_row}x',
+        '-geometry', f'{thumbnail_width}x{thumbnail_height}+{padding}+{padding}',
+    ]
+    if page_info:
+        command += ['-title', page_info]
+    command += [
+        '-quality', str(output_quality),
+        '-sampling-factor', JPEG_SAMPLING_FACTOR,
+        '-strip',
+        output_path,
+    ]
+
+    result = subprocess.run(command, capture_output=True, text=True)
+    if result.returncode != 0:
+        logger.error(f"montage failed for {output_path}: {result.stderr.strip()}")
+        return False
+    return True
+
+# Characters whose advances are measured up front for label layout
+LABEL_CHARS = string.ascii_letters + string.digits + '._-'
+
+def build_glyph_advances(draw: Drawing, image: Image) -> Tuple[Dict[str, float], int]:
+    """
+    Measure the advance of each common label character once.
+    Returns a tuple of (advances by character, text height).
+    """
+    advances = {}
+    text_height = 0
+    for ch in LABEL_CHARS:
+        metrics = draw.get_font_metrics(image, ch)
+        advances[ch] = metrics.text_width
+        text_height = max(text_height, int(metrics.text_height))
+    return advances, text_height
+
+# Glyph advances and text height, built on first use and shared by every page in this process
+_glyph_metrics: Optional[Tuple[Dict[str, float], int]] = None
+
+def get_glyph_advances() -> Tuple[Dict[str, float], int]:
+    """
+    Return the (advances by character, text height) table for the label font.
+    The font and size are the same for every page, so the table is measured once per process.
+    """
+    global _glyph_metrics
+    if _glyph_metrics is None:
+        with Drawing() as draw, Image(width=1, height=1) as scratch:
+            setup_drawing(draw)
+            _glyph_metrics = build_glyph_advances(draw, scratch)
+    return _glyph_metrics
+
+def measure_text_width(draw: Drawing, image: Image, text: str, advances: Dict[str, float]) -> int:
+    """Estimate the rendered width of text from per-character advances, measuring unknown characters on demand."""
+    width = 0.0
+    for ch in text:
+        advance = advances.get(ch)
+        if advance is None:
+            advance = advances[ch] = draw.get_font_metrics(image, ch).text_width
+        width += advance
+    return int(width)
+
+def setup_drawing(draw: Drawing) -> None:
+    """Apply the shared label and frame settings to a drawing."""
+    draw.font_size = 14
+    if RESOLVED_FONT:
+        draw.font = RESOLVED_FONT
+    draw.fill_color = Color('black')
+    draw.stroke_color = Color('black')
+    draw.stroke_width = 1
+    draw.text_alignment = 'center'
+
+def draw_label_strip(canvas: Image, labels: List[Tuple[int, str, int]],
+                     top: int, strip_height: int, label_height: int) -> None:
+    """
+    Render one row of filename labels onto a transparent strip with a single
+    Drawing pass, then composite the strip onto the canvas at the given top.
+    Labels are (center x, text, text width) tuples.
+    """
+    text_y = 25
+    with Image(width=canvas.width, height=strip_height, background=Color('transparent')) as strip:
+        with Drawing() as label_draw:
+            setup_drawing(label_draw)
+
+            for text_x, text, text_width in labels:
+                # Semi-transparent background for the text
+                label_draw.push()
+                label_draw.fill_color = Color('white')
+                label_draw.fill_opacity = 0.7
+                label_draw.stroke_opacity = 0
+                label_draw.rectangle(
+                    left=int(text_x - text_width//2 - 5),
+                    top=int(text_y - label_height - 5),
+                    right=int(text_x + text_width//2 + 5),
+                    bottom=int(text_y + 5)
+                )
+                label_draw.pop()
+
+                label_draw.text(x=text_x, y=text_y, body=text)
+
+            label_draw(strip)
+        canvas.composite(strip, left=0, top=top)
+
+def add_frames_path(draw: Drawing, frames: List[Tuple[int, int, int, int]]) -> None:
+    """
+    Queue (left, top, right, bottom) frame rectangles on the drawing as one
+    unfilled path, so ImageMagick renders them all as a single primitive.
+    """
+    if not frames:
+        return
+
+    draw.push()
+    draw.fill_opacity = 0
+    draw.path_start()
+    for left, top, right, bottom in frames:
+        draw.path_move(to=(left, top))
+        draw.path_horizontal_line(x=right)
+        draw.path_vertical_line(y=bottom)
+        draw.path_horizontal_line(x=left)
+        draw.path_close()
+    draw.path_finish()
+    draw.pop()
+
+def resolve_font() -> Optional[str]:
+    """Return the first label font ImageMagick accepts, or None to use its default."""
+    with Drawing() as probe:
+        for font in ['Helvetica', 'Arial', 'DejaVu Sans', 'Liberation Sans']:
+            try:
+                probe.font = font
+                return font
+            except Exception:
+                continue
+    return None
+
+# Label font, resolved once at import instead of for every page
+RESOLVED_FONT = resolve_font()
+
+def init_worker() -> None:
+    """
+    Initialize a worker process.
+    Pages already render in parallel across processes, so keep ImageMagick
+    and libvips single-threaded inside each worker to avoid oversubscribing the CPUs.
+    """
+    os.environ['MAGICK_THREAD_LIMIT'] = '1'
+    limits['thread'] = 1
+    if pyvips is not None:
+        pyvips.concurrency_set(1)
+
 def create_index_thumbnail(images: List[str], output_path: str, 
                          thumbnails_per_row: int = 5,
                          thumbnail_width: int = 200,
                          thumbnail_height: int = 200,
                          background_color: str = '#ffffff',
                          max_thumbnails: int = 100,
-                         page_number: int = 1) -> Tuple[bool, bool]:
+                         page_number: int = 1,
+                         use_montage: bool = False,
+                         decode_threads: int = 1,
+                         output_quality: int = DEFAULT_OUTPUT_QUALITY) -> Tuple[bool, bool]:
     """
     Create an index thumbnail from a list of images.
+    If use_montage is set, the page is rendered by ImageMagick's montage tool
+    unless it contains raw files, falling back to Wand if montage fails.
+    Images are decoded on decode_threads background threads.
     Returns a tuple of (success, has_more_pages).
     """
     try:
@@ -87,7 +410,17 @@ def create_index_thumbnail(images: List[str], output_path: str,
         # Parameters for text and spacing
         text_height = 40
         padding = 10
-        frame_color = Color('black')
+
+        total_pages = math.ceil(len(images) / max_thumbnails)
+        page_info = f"Page {page_number} of {total_pages}" if total_pages > 1 else None
+
+        if use_montage and not any(Path(p).suffix.lower() in RAW_FORMATS for p in current_page_images):
+            if create_index_with_montage(current_page_images, output_path,
+                                         thumbnails_per_row, thumbnail_width, thumbnail_height,
+                                         background_color, padding, page_info,
+                                         output_quality):
+                logger.info(f"Saved index thumbnail: {output_path}")
+                return True, has_more_pages
         
         # Calculate grid dimensions
         num_images = len(current_page_images)
@@ -96,50 +429,56 @@ def create_index_thumbnail(images: List[str], output_path: str,
 
         # Create blank canvas
         canvas_width = cols * (thumbnail_width + 2 * padding)
-        canvas_height = rows * (thumbnail_height + text_height + 2 * padding)
+        row_height = thumbnail_height + text_height + 2 * padding
+        canvas_height = rows * row_height
 
         # Add page information if there are multiple pages
-        if len(images) > max_thumbnails:
+        if page_info:
             canvas_height += 40  # Extra space for page information
 
-        with Image(width=canvas_width, height=canvas_height, background=background_color) as canvas:
-            with Drawing() as draw:
-                # Set up drawing properties
-                draw.font_size = 14
-                for font in ['Helvetica', 'Arial', 'DejaVu Sans', 'Liberation Sans']:
-                    try:
-                        draw.font = font
-                        break
-                    except Exception:
-                        continue
-                
-                draw.fill_color = Color('black')
-                draw.stroke_color = frame_color
-                draw.stroke_width = 1
-                draw.text_alignment = 'center'
-
-                # Process images in the current page
-                for idx, img_path in enumerate(current_page_images):
+        with ThreadPoolExecutor(max_workers=decode_threads) as decoder, \
+                Image(width=canvas_width, height=canvas_height, background=background_color) as canvas, \
+                Drawing() as draw:
+            setup_drawing(draw)
+
+            # Label widths are summed from per-character advances measured once per process
+            advances, label_height = get_glyph_advances()
+
+            # Decode in background threads while the canvas is composited here
+            thumbnails = decoder.map(
+                lambda path: decode_thumbnail(path, thumbnail_width, thumbnail_height),
+                current_page_images
+            )
+            pending = enumerate(zip(current_page_images, thumbnails))
+
+            frames = []
+            for row in range(rows):
+                row_top = row * row_height
+                # Labels are collected per row and rendered as one strip per row
+                row_labels = []
+
+                for idx, (img_path, thumbnail) in islice(pending, thumbnails_per_row):
+                    if idx % PROGRESS_LOG_INTERVAL == 0:
+                        batch_end = min(start_idx + idx + PROGRESS_LOG_INTERVAL, end_idx)
+                        logger.info(f"Processing images {start_idx + idx + 1}-{batch_end} of {len(images)} for {output_path}")
                     try:
-                        logger.info(f"Processing image {start_idx + idx + 1} of {len(images)}: {img_path}")
-                        with Image(filename=img_path) as img:
-                            # Resize maintaining aspect ratio
-                            img.transform(resize=f'{thumbnail_width}x{thumbnail_height}')
-                            
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug(f"Processing image {start_idx + idx + 1} of {len(images)}: {img_path}")
+                        if thumbnail is None:
+                            continue
+                        with thumbnail as img:
                             # Calculate position
-                            row = idx // thumbnails_per_row
                             col = idx % thumbnails_per_row
                             x = col * (thumbnail_width + 2 * padding) + padding
-                            y = row * (thumbnail_height + text_height + 2 * padding) + padding
-
-                            # Draw frame
-                            draw.fill_opacity = 0
-                            draw.rectangle(
-                                left=int(x - 1),
-                                top=int(y - 1),
-                                right=int(x + thumbnail_width + 1),
-                                bottom=int(y + thumbnail_height + 1)
-                            )
+                            y = row_top + padding
+
+                            # Queue frame
+                            frames.append((
+                                int(x - 1),
+                                int(y - 1),
+                                int(x + thumbnail_width + 1),
+                                int(y + thumbnail_height + 1)
+                            ))
                             
                             # Composite image onto canvas
                             canvas.composite(img, left=int(x), top=int(y))
@@ -149,57 +488,38 @@ def create_index_thumbnail(images: List[str], output_path: str,
                             if len(filename) > 25:
                                 filename = filename[:22] + "..."
                             
-                            # Calculate text position
+                            # Queue the label for this row's strip
                             text_x = x + thumbnail_width // 2
-                            text_y = y + thumbnail_height + 25
-                            
-                            # Draw text background
-                            metrics = draw.get_font_metrics(canvas, filename)
-                            text_width = int(metrics.text_width)
-                            text_height = int(metrics.text_height)
-                            
-                            # Draw semi-transparent background for text
-                            with Drawing() as bg_draw:
-                                bg_draw.fill_color = Color('white')
-                                bg_draw.fill_opacity = 0.7
-                                bg_draw.stroke_opacity = 0
-                                bg_draw.rectangle(
-                                    left=int(text_x - text_width//2 - 5),
-                                    top=int(text_y - text_height - 5),
-                                    right=int(text_x + text_width//2 + 5),
-                                    bottom=int(text_y + 5)
-                                )
-                                bg_draw(canvas)
-                            
-                            # Draw text
-                            draw.fill_opacity = 1
-                            draw.text(
-                                x=int(text_x),
-                                y=int(text_y),
-                                body=filename
-                            )
+                            label_width = measure_text_width(draw, canvas, filename, advances)
+                            row_labels.append((int(text_x), filename, label_width))
 
                     except Exception as e:
                         logger.error(f"Error processing image {img_path}: {str(e)}")
                         continue
 
-                # Add page information if there are multiple pages
-                if len(images) > max_thumbnails:
-                    total_pages = math.ceil(len(images) / max_thumbnails)
-                    page_info = f"Page {page_number} of {total_pages}"
-                    metrics = draw.get_font_metrics(canvas, page_info)
-                    
-                    # Draw page information at the bottom
-                    draw.text(
-                        x=int(canvas_width // 2),
-                        y=int(canvas_height - 15),
-                        body=page_info
-                    )
-
-                # Apply all drawing operations to the canvas
-                draw(canvas)
-
-            # Save the index thumbnail
+                if row_labels:
+                    draw_label_strip(canvas, row_labels,
+                                     row_top + padding + thumbnail_height, text_height, label_height)
+
+            # Draw all frames as a single path primitive
+            add_frames_path(draw, frames)
+
+            # Add page information if there are multiple pages
+            if page_info:
+                # Draw page information at the bottom
+                draw.text(
+                    x=int(canvas_width // 2),
+                    y=int(canvas_height - 15),
+                    body=page_info
+                )
+
+            # Apply all drawing operations to the canvas
+            draw(canvas)
+
+            # Save the index thumbnail as a small preview JPEG without metadata
+            canvas.compression_quality = output_quality
+            canvas.options['jpeg:sampling-factor'] = JPEG_SAMPLING_FACTOR
+            canvas.strip()
             canvas.save(filename=output_path)
             logger.info(f"Saved index thumbnail: {output_path}")
             return True, has_more_pages
@@ -208,6 +528,20 @@ def create_index_thumbnail(images: List[str], output_path: str,
         logger.error(f"Error creating index thumbnail for {output_path}: {str(e)}")
         return False, False
 
+def positive_int(value: str) -> int:
+    """Argparse type for integers that must be at least 1."""
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+def quality(value: str) -> int:
+    """Argparse type for JPEG quality values, which must be between 1 and 100."""
+    number = int(value)
+    if not 1 <= number <= 100:
+        raise argparse.ArgumentTypeError(f"must be between 1 and 100, got {value}")
+    return number
+
 def main():
     parser = argparse.ArgumentParser(description='Generate index thumbnails for image directories')
     parser.add_argument('directory', help='Root directory to process')
@@ -221,6 +555,14 @@ def main():
                       help='Maximum number of thumbnails per index image (default: 200)')
     parser.add_argument('--output-dir', type=str,
                       help='Optional output directory for index files. If not specified, index files will be created in their source directories.')
+    parser.add_argument('--workers', type=positive_int, default=os.cpu_count(),
+                      help='Number of worker processes used to render index pages (default: number of CPUs)')
+    parser.add_argument('--montage', action='store_true',
+                      help="Render pages with ImageMagick's montage command instead of Wand (raw files still use Wand)")
+    parser.add_argument('--force', action='store_true',
+                      help='Regenerate index files even if they are newer than all of their images')
+    parser.add_argument('--output-quality', type=quality, default=DEFAULT_OUTPUT_QUALITY,
+                      help=f'JPEG quality of the index files (default: {DEFAULT_OUTPUT_QUALITY})')
     args = parser.parse_args()
 
     root_dir = args.directory
@@ -234,12 +576,14 @@ def main():
 
     # Collect all images grouped by month
     logger.info(f"Scanning directory: {root_dir}")
-    image_groups = collect_images_by_month(root_dir)
+    month_mtimes = {}
+    image_groups = collect_images_by_month(root_dir, month_mtimes)
 
     # Sort months chronologically
     sorted_months = sorted(image_groups.keys())
 
-    # Process each month
+    # Build one job per index page so months and pages can render in parallel
+    jobs = []
     for month in sorted_months:
         images = image_groups[month]
         if not images:
@@ -249,9 +593,13 @@ def main():
         
         # Calculate total number of pages
         total_pages = (len(images) + args.max_thumbnails - 1) // args.max_thumbnails
-        page_number = 1
+
+        # An insertion or deletion anywhere in the month can shift images between
+        # pages, so every page is checked against the month's newest image or directory
+        if not args.force:
+            month_newest = newest_mtime(images, month_mtimes.get(month, 0.0))
         
-        while True:
+        for page_number in range(1, total_pages + 1):
             # Generate index filename with 3-digit padding
             if total_pages > 1:
                 index_filename = f"index_{month}_{page_number:03d}.jpg"
@@ -265,25 +613,47 @@ def main():
                 # If no output directory specified, place in the year directory
                 year = month[:4]
                 output_filename = os.path.join(root_dir, year, index_filename)
-            
-            success, has_more_pages = create_index_thumbnail(
+
+            if not args.force and is_up_to_date(output_filename, month_newest):
+                logger.info(f"Index thumbnail is up to date, skipping: {output_filename}")
+                continue
+
+            jobs.append((month, images, output_filename, page_number))
+
+    # Split the CPUs between worker processes so decoder threads don't oversubscribe them
+    # (os.cpu_count() can return None, which is also the --workers default)
+    cpu_count = os.cpu_count() or 1
+    workers = args.workers or cpu_count
+    decode_threads = max(1, cpu_count // workers)
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor:
+        futures = {
+            executor.submit(
+                create_index_thumbnail,
                 images,
                 output_filename,
                 args.thumbnails_per_row,
                 args.thumbnail_width,
                 args.thumbnail_height,
                 max_thumbnails=args.max_thumbnails,
-                page_number=page_number
-            )
-            
+                page_number=page_number,
+                use_montage=args.montage,
+                decode_threads=decode_threads,
+                output_quality=args.output_quality
+            ): (month, page_number)
+            for month, images, output_filename, page_number in jobs
+        }
+
+        for future in as_completed(futures):
+            month, page_number = futures[future]
+            try:
+                success, _ = future.result()
+            except Exception as e:
+                logger.error(f"Worker failed for month {month}, page {page_number}: {str(e)}")
+                success = False
+
             if not success:
-                logger.error(f"Failed to create index thumbnail for month: {month}")
-                break
-                
-            if not has_more_pages:
-                break
-                
-            page_number += 1
+                logger.error(f"Failed to create index thumbnail for month: {month} (page {page_number})")
 
 if __name__ == "__main__":
     main()